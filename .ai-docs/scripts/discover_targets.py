@@ -1,9 +1,11 @@
-import os
+import re
 import yaml
 import logging
 from pathlib import Path
 from typing import Dict, Set, Any, Optional
 
+from docs_common import SafeDumper, iter_repo_files, load_yaml_cached
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,8 +25,7 @@ def load_yaml(path: Path) -> Dict[str, Any]:
     if not path.exists():
         return {}
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f) or {}
+        return load_yaml_cached(path) or {}
     except (yaml.YAMLError, IOError) as e:
         logging.error(f"Failed to load {path}: {e}")
         return {}
@@ -33,7 +34,7 @@ def save_yaml(path: Path, data: Dict[str, Any]) -> bool:
     """Save data to YAML file. Returns True on success."""
     try:
         with open(path, 'w', encoding='utf-8') as f:
-            yaml.safe_dump(data, f, default_flow_style=False, sort_keys=False)
+            yaml.dump(data, f, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
         return True
     except (yaml.YAMLError, IOError) as e:
         logging.error(f"Failed to save {path}: {e}")
@@ -60,24 +61,35 @@ def scan_repository_extensions(
         ignore_dirs: Set of directory names to skip
 
     Returns:
-        Set of found extensions
+        Set of found extensions. The scan stops early once every known
+        extension has been found.
     """
     if ignore_dirs is None:
         ignore_dirs = DEFAULT_IGNORE_DIRS
 
     found_extensions: Set[str] = set()
-
-    for root, dirs, files in os.walk(root_dir):
-        # Modify dirs in-place to skip ignored directories
-        dirs[:] = [d for d in dirs if d not in ignore_dirs]
-
-        for file in files:
-            name_lower = file.lower()
-
-            # Check for explicitly mapped extensions (longest match first)
-            for ext in known_extensions:
-                if name_lower.endswith(ext):
-                    found_extensions.add(ext)
+    if not known_extensions:
+        return found_extensions
+
+    # Single anchored alternation, compiled once for the whole traversal.
+    # Extensions are ordered longest first, and the leftmost match wins, so
+    # e.g. '.orch.yaml' is preferred over a shorter '.yaml' suffix.
+    canonical = {ext.lower(): ext for ext in known_extensions}
+    total_extensions = len(canonical)
+    suffix_re = re.compile(
+        '(' + '|'.join(re.escape(ext) for ext in known_extensions) + ')$',
+        re.IGNORECASE
+    )
+
+    # Single scandir-based walk shared with generate_docs.py
+    for _, name in iter_repo_files(root_dir, prune_dirs=ignore_dirs):
+        match = suffix_re.search(name)
+        if match:
+            found_extensions.add(canonical[match.group(1).lower()])
+            # Only presence matters: once every extension has been
+            # seen, the rest of the tree cannot change the result.
+            if len(found_extensions) == total_extensions:
+                return found_extensions
 
     return found_extensions
 
@@ -0,0 +1,207 @@
+import os
+import re
+import json
+import yaml
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Pattern, Tuple, Union
+
+# Shared helpers for the .ai-docs scripts. Each script is run directly
+# (python .ai-docs/scripts/<name>.py), so this module is imported as a sibling.
+
+# Prefer the libyaml C implementation when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+
+# Per-user cache directory, shared by every script in the pipeline
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "ai-docs"
+YAML_CACHE_DIR = CACHE_DIR / "yaml"
+
+def _yaml_cache_file(resolved_path: str) -> Path:
+    """Cache file location for a given (absolute) YAML path."""
+    digest = hashlib.sha256(resolved_path.encode("utf-8")).hexdigest()
+    return YAML_CACHE_DIR / f"{digest}.json"
+
+def _store_yaml_cache(cache_file: Path, entry: Any) -> None:
+    """Write a cache entry atomically. Failures are logged and ignored."""
+    try:
+        payload = json.dumps(entry)
+        # Only cache data that survives a JSON round trip unchanged
+        # (e.g. no dates, no non-string mapping keys).
+        if json.loads(payload)["data"] != entry["data"]:
+            logging.debug(f"Not caching {entry['path']}: data is not JSON-safe")
+            return
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(tmp_file, cache_file)
+    except (TypeError, ValueError, OSError) as e:
+        logging.debug(f"Could not write YAML cache {cache_file}: {e}")
+
+def load_yaml_cached(path: Union[str, Path]) -> Any:
+    """
+    Parse a YAML file, reusing a previous parse if the file is unchanged.
+
+    Parsed data is cached on disk keyed by (path, mtime, size), so the
+    scripts in the pipeline only parse config.yaml once between edits.
+    Raises the same errors as opening and parsing the file directly.
+    """
+    resolved = os.path.abspath(path)
+    st = os.stat(resolved)
+    cache_file = _yaml_cache_file(resolved)
+
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+        if (entry.get("path") == resolved
+                and entry.get("mtime_ns") == st.st_mtime_ns
+                and entry.get("size") == st.st_size):
+            return entry["data"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass  # Missing or unreadable cache entry: fall through to a parse
+
+    with open(resolved, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=SafeLoader)
+
+    _store_yaml_cache(cache_file, {
+        "path": resolved,
+        "mtime_ns": st.st_mtime_ns,
+        "size": st.st_size,
+        "data": data,
+    })
+    return data
+
+# --- Repository Traversal ---
+
+def iter_repo_files(root: Union[str, Path], prune_dirs: Iterable[str] = ()) -> Iterator[Tuple[str, str]]:
+    """
+    Walk the tree under root once, yielding (relative_path, name) for each file.
+
+    Uses an explicit stack over os.scandir, so entry types come from the
+    directory listing instead of a stat() per entry. Directories whose name
+    is in prune_dirs are not entered; symlinked directories are not followed.
+    Relative paths use os.sep, like glob.glob.
+    """
+    prune_dirs = set(prune_dirs)
+    stack = [(str(root), "")]
+    while stack:
+        dir_path, rel_dir = stack.pop()
+        try:
+            it = os.scandir(dir_path)
+        except OSError as e:
+            logging.debug(f"Cannot scan directory: {e}")
+            continue
+
+        with it:
+            for entry in it:
+                rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in prune_dirs:
+                        stack.append((entry.path, rel_path))
+                elif entry.is_file():
+                    yield rel_path, entry.name
+
+def _translate_glob_class(segment: str, i: int, j: int) -> str:
+    """
+    Translate the bracket expression segment[i:j] (between '[' and ']') to a
+    regex, following fnmatch.translate.
+    """
+    stuff = segment[i:j]
+    if "-" not in stuff:
+        stuff = stuff.replace("\\", r"\\")
+    else:
+        chunks = []
+        k = i + 2 if segment[i] == "!" else i + 1
+        while True:
+            k = segment.find("-", k, j)
+            if k < 0:
+                break
+            chunks.append(segment[i:k])
+            i = k + 1
+            k = k + 3
+        chunk = segment[i:j]
+        if chunk:
+            chunks.append(chunk)
+        else:
+            chunks[-1] += "-"
+        # Remove empty ranges -- invalid in RE
+        for k in range(len(chunks) - 1, 0, -1):
+            if chunks[k - 1][-1] > chunks[k][0]:
+                chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+                del chunks[k]
+        # Escape backslashes and hyphens; hyphens that form ranges stay as-is
+        stuff = "-".join(s.replace("\\", r"\\").replace("-", r"\-") for s in chunks)
+    # Escape set operations (&&, ~~, ||) and '[' (possible nested set)
+    stuff = re.sub(r"([&~|\[])", r"\\\1", stuff)
+    if not stuff:
+        return "(?!)"  # Empty range: never matches
+    if stuff == "!":
+        return "[^/]"  # Negated empty range: any character
+    if stuff[0] == "!":
+        stuff = "^" + stuff[1:]
+    elif stuff[0] == "^":
+        stuff = "\\" + stuff
+    # A negated class or a range may include '/'; never cross a segment
+    return f"(?!/)[{stuff}]"
+
+def _translate_glob_segment(segment: str) -> str:
+    """Translate one path segment of a glob ('*', '?', '[...]') to a regex."""
+    out = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            while j < n and segment[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+            else:
+                out.append(_translate_glob_class(segment, i, j))
+                i = j + 1
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+def compile_glob(pattern: str, include_hidden: bool = False) -> Pattern[str]:
+    """
+    Compile a recursive glob pattern into a regex matched against '/'-separated
+    relative paths (use .fullmatch).
+
+    Follows glob.glob(pattern, recursive=True): '**' as a whole segment spans
+    zero or more directories, '*' and '?' never cross '/', and unless
+    include_hidden is set, wildcards do not match names starting with '.'.
+    """
+    hidden_guard = "" if include_hidden else r"(?!\.)"
+    segments = pattern.split("/")
+    # Walked paths are relative to the root, so drop a leading './'
+    while len(segments) > 1 and segments[0] == ".":
+        segments.pop(0)
+    parts = []
+    for i, segment in enumerate(segments):
+        last = i == len(segments) - 1
+        if segment == "**":
+            if last:
+                parts.append(f"{hidden_guard}[^/]+(?:/{hidden_guard}[^/]+)*")
+            else:
+                parts.append(f"(?:{hidden_guard}[^/]+/)*")
+            continue
+        if not segment.startswith("."):
+            parts.append(hidden_guard)
+        parts.append(_translate_glob_segment(segment))
+        if not last:
+            parts.append("/")
+    return re.compile("".join(parts), re.DOTALL)
@@ -1,11 +1,19 @@
 import os
 import sys
-import yaml
+import re
+import json
+import time
 import glob
+import hashlib
+import subprocess
+import functools
+import asyncio
 import argparse
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import AsyncIterator, Dict, List, Set, Tuple, Any, Optional, Pattern, TextIO
+
+from docs_common import CACHE_DIR, compile_glob, iter_repo_files, load_yaml_cached
 
 # Configure logging
 logging.basicConfig(
@@ -18,15 +26,72 @@ CONFIG_PATH = os.path.join(os.path.dirname(__file__), "../config.yaml")
 TEMPLATE_DIR = os.path.join(os.path.dirname(__file__), "../templates")
 MAX_FILE_SIZE_BYTES = 500_000  # 500KB - warn if file exceeds this
 MAX_CONTENT_CHARS = 100_000   # Truncate content sent to LLM
+DEFAULT_CONCURRENCY = 8       # Concurrent LLM requests
+DEFAULT_BATCH_SIZE = 8        # Max small files combined into one LLM request
+BATCH_MAX_CHARS = 40_000      # Max combined content per batched request
+BATCH_FILE_MAX_BYTES = 5_000  # Only files up to this size are batched
+WALK_PRUNE_DIRS = {".git"}    # Never matched by target globs, so never walked
+RESPONSE_CACHE_DIR = CACHE_DIR / "responses"  # Generated docs keyed by prompt hash
+
+# Create output files relative to an open directory descriptor (openat).
+# OutputDir.replace() calls os.replace with dir_fds, but CPython only lists
+# os.rename in supports_dir_fd; both wrap the same renameat() call.
+DIR_FD_SUPPORTED = (
+    hasattr(os, "O_DIRECTORY")
+    and {os.open, os.rename, os.unlink} <= os.supports_dir_fd
+)
+
+# Flattens a source path into a wiki page name in one pass: "a/b.py" -> "a_b_py"
+SAFE_NAME_TABLE = str.maketrans({"\\": "_", "/": "_", ".": "_"})
+
+# Leading ```markdown / ``` and trailing ``` fences (each optional) around a response
+MARKDOWN_FENCE_RE = re.compile(r"(?:```(?:markdown)?)?(.*?)(?:```)?", re.DOTALL)
+# Trailing run of a streamed response that may still turn out to be a closing fence
+STREAM_TAIL_RE = re.compile(r"[\s`]*\Z")
 
 # --- LLM Provider Abstraction ---
 
 class LLMProvider(ABC):
     @abstractmethod
-    def generate(self, prompt: str, model: str) -> str:
-        pass
+    def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        """Yields the response text in chunks as the model produces it."""
+
+    async def generate(self, prompt: str, model: str) -> str:
+        """Returns the complete response text."""
+        return "".join([chunk async for chunk in self.stream(prompt, model)])
+
+    async def close(self) -> None:
+        """Release the client's connections. Called once all requests are done."""
+
+def make_async_http_client(sdk: Any, max_connections: int) -> Optional[Any]:
+    """
+    Builds the httpx client an OpenAI/Anthropic async SDK client sends requests through.
+
+    Every request reuses this one connection pool, sized for the configured
+    concurrency, so TLS handshakes happen once per connection rather than per
+    file. HTTP/2 is enabled when the optional 'h2' package is installed.
+    Uses the SDK's DefaultAsyncHttpxClient to keep its timeout defaults;
+    returns None (SDK default client) on SDK versions without it.
+    """
+    client_class = getattr(sdk, "DefaultAsyncHttpxClient", None)
+    if client_class is None:
+        return None
+
+    import httpx
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+
+    return client_class(
+        http2=http2,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
 
 class GoogleProvider(LLMProvider):
+    # genai.Client keeps its own connection pool; it is created once per
+    # provider, and the provider once per run (see get_llm_provider).
     def __init__(self, api_key: str):
         try:
             from google import genai
@@ -35,47 +100,96 @@ class GoogleProvider(LLMProvider):
             logging.error("'google-genai' library not installed. Please run 'pip install google-genai'.")
             sys.exit(1)
 
-    def generate(self, prompt: str, model: str) -> str:
-        response = self.client.models.generate_content(
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        response = await self.client.aio.models.generate_content_stream(
             model=model,
             contents=prompt
         )
-        return response.text
+        async for chunk in response:
+            if chunk.text:
+                yield chunk.text
+
+    async def close(self) -> None:
+        aclose = getattr(self.client.aio, "aclose", None)
+        if aclose:
+            await aclose()
 
 class OpenAIProvider(LLMProvider):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_connections: int = DEFAULT_CONCURRENCY):
         try:
-            from openai import OpenAI
-            self.client = OpenAI(api_key=api_key)
+            import openai
+            self.client = openai.AsyncOpenAI(
+                api_key=api_key,
+                http_client=make_async_http_client(openai, max_connections)
+            )
         except ImportError:
             logging.error("'openai' library not installed. Please run 'pip install openai'.")
             sys.exit(1)
 
-    def generate(self, prompt: str, model: str) -> str:
-        response = self.client.chat.completions.create(
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        response = await self.client.chat.completions.create(
             model=model,
-            messages=[{"role": "user", "content": prompt}]
+            messages=[{"role": "user", "content": prompt}],
+            stream=True
         )
-        return response.choices[0].message.content
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def close(self) -> None:
+        await self.client.close()
 
 class AnthropicProvider(LLMProvider):
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_connections: int = DEFAULT_CONCURRENCY):
         try:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=api_key)
+            self.client = anthropic.AsyncAnthropic(
+                api_key=api_key,
+                http_client=make_async_http_client(anthropic, max_connections)
+            )
         except ImportError:
             logging.error("'anthropic' library not installed. Please run 'pip install anthropic'.")
             sys.exit(1)
 
-    def generate(self, prompt: str, model: str) -> str:
-        response = self.client.messages.create(
+    async def stream(self, prompt: str, model: str) -> AsyncIterator[str]:
+        async with self.client.messages.stream(
             model=model,
             max_tokens=4096,
             messages=[{"role": "user", "content": prompt}]
-        )
-        return response.content[0].text
+        ) as response:
+            async for text in response.text_stream:
+                yield text
+
+    async def close(self) -> None:
+        await self.client.close()
+
+_llm_provider: Optional[LLMProvider] = None
+
+def get_llm_provider(config: Dict[str, Any], max_connections: int = DEFAULT_CONCURRENCY) -> LLMProvider:
+    """
+    Returns the LLM provider for this run, creating it on first use.
+
+    The provider (and its client's connection pool) is a singleton, so every
+    concurrent request shares the same connections.
+    """
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = create_llm_provider(config, max_connections)
+    return _llm_provider
+
+async def close_llm_provider() -> None:
+    """
+    Closes the provider returned by get_llm_provider, if any.
 
-def get_llm_provider(config: Dict[str, Any]) -> LLMProvider:
+    The singleton is cleared first, so a later get_llm_provider call builds a
+    new provider instead of returning one whose client is already closed.
+    """
+    global _llm_provider
+    provider, _llm_provider = _llm_provider, None
+    if provider is not None:
+        await provider.close()
+
+def create_llm_provider(config: Dict[str, Any], max_connections: int) -> LLMProvider:
     """Factory function to create the appropriate LLM provider."""
     provider_name = config.get("provider", "google").lower()
 
@@ -91,14 +205,14 @@ def get_llm_provider(config: Dict[str, Any]) -> LLMProvider:
         if not api_key:
             logging.error("OPENAI_API_KEY environment variable not set.")
             sys.exit(1)
-        return OpenAIProvider(api_key)
+        return OpenAIProvider(api_key, max_connections)
 
     elif provider_name == "anthropic":
         api_key = os.environ.get("ANTHROPIC_API_KEY")
         if not api_key:
             logging.error("ANTHROPIC_API_KEY environment variable not set.")
             sys.exit(1)
-        return AnthropicProvider(api_key)
+        return AnthropicProvider(api_key, max_connections)
 
     else:
         logging.error(f"Unsupported provider '{provider_name}'. Supported: google, openai, anthropic.")
@@ -111,11 +225,11 @@ def load_config() -> Dict[str, Any]:
     if not os.path.exists(CONFIG_PATH):
         logging.error(f"Config file not found at {CONFIG_PATH}")
         sys.exit(1)
-    with open(CONFIG_PATH, "r") as f:
-        return yaml.safe_load(f)
+    return load_yaml_cached(CONFIG_PATH)
 
+@functools.lru_cache(maxsize=None)
 def load_template(template_name: str) -> str:
-    """Loads a markdown template from the templates directory."""
+    """Loads a markdown template from the templates directory (memoized per run)."""
     path = os.path.join(TEMPLATE_DIR, template_name)
     if not os.path.exists(path):
         logging.warning(f"Template {template_name} not found. Using generic fallback.")
@@ -128,22 +242,220 @@ def clean_markdown_response(text: Optional[str]) -> str:
     """Removes markdown code fences if present."""
     if not text:
         return ""
-    text = text.strip()
     # Remove ```markdown or ``` if it wraps the entire response
-    if text.startswith("```markdown"):
-        text = text[11:]
-    elif text.startswith("```"):
-        text = text[3:]
-    if text.endswith("```"):
-        text = text[:-3]
-    return text.strip()
-
-def should_skip_file(file_path: str, ignore_patterns: List[str]) -> bool:
+    return MARKDOWN_FENCE_RE.fullmatch(text.strip()).group(1).strip()
+
+class MarkdownStreamCleaner:
+    """
+    Incremental clean_markdown_response() for a streamed response.
+
+    feed() returns the text that is safe to write so far: the start is held
+    back until a leading fence can be ruled in or out, and any trailing run
+    of whitespace/backticks is held back in case it is the closing fence.
+    finish() returns the remainder. The concatenated output equals
+    clean_markdown_response() of the full text.
+    """
+
+    OPEN_FENCE = "```markdown"
+
+    def __init__(self):
+        self._head: Optional[str] = ""  # None once the leading fence is handled
+        self._tail = ""
+        self._at_start = True
+
+    @staticmethod
+    def _strip_open_fence(text: str) -> str:
+        if text.startswith("```markdown"):
+            return text[11:]
+        if text.startswith("```"):
+            return text[3:]
+        return text
+
+    def _emit(self, text: str) -> str:
+        text = self._tail + text
+        if self._at_start:
+            text = text.lstrip()
+            if not text:
+                return ""
+            self._at_start = False
+        cut = STREAM_TAIL_RE.search(text).start()
+        self._tail = text[cut:]
+        return text[:cut]
+
+    def feed(self, chunk: str) -> str:
+        if self._head is not None:
+            self._head += chunk
+            head = self._head.lstrip()
+            if len(head) < len(self.OPEN_FENCE) and self.OPEN_FENCE.startswith(head):
+                return ""
+            self._head = None
+            chunk = self._strip_open_fence(head)
+        return self._emit(chunk)
+
+    def finish(self) -> str:
+        out = ""
+        if self._head is not None:
+            out = self._emit(self._strip_open_fence(self._head.lstrip()))
+            self._head = None
+        tail = self._tail.rstrip()
+        if tail.endswith("```"):
+            tail = tail[:-3]
+        self._tail = ""
+        return out + tail.rstrip()
+
+def compile_ignore_patterns(ignore_patterns: List[str]) -> Optional[Pattern[str]]:
+    """
+    Combines all ignore patterns (glob syntax) into a single regex.
+
+    Hidden files are matched like any other, and a pattern without a '/'
+    matches that name at any depth. Returns None if there are no patterns.
+    """
+    alternatives = []
+    for pattern in ignore_patterns:
+        if "/" not in pattern:
+            pattern = f"**/{pattern}"
+        alternatives.append(f"(?:{compile_glob(pattern, include_hidden=True).pattern})")
+    if not alternatives:
+        return None
+    return re.compile("|".join(alternatives), re.DOTALL)
+
+def should_skip_file(file_path: str, ignore_re: Optional[Pattern[str]]) -> bool:
     """Check if file matches any ignore pattern."""
+    if ignore_re is None:
+        return False
+    return ignore_re.fullmatch(file_path.replace(os.sep, "/")) is not None
+
+def match_target_files(patterns: List[str], repo_files: List[Tuple[str, str]]) -> List[List[str]]:
+    """
+    Returns the files matching each target pattern (glob syntax, recursive).
+
+    repo_files holds (path, '/'-separated path) pairs from a single walk of
+    the repository. All patterns are compiled up front and the files are
+    dispatched in one pass; each file goes to the first pattern that matches
+    it, so earlier targets take precedence.
+    """
+    matches: List[List[str]] = [[] for _ in patterns]
+    matchers = []
+    for i, pattern in enumerate(patterns):
+        if os.path.isabs(pattern) or ".." in pattern.replace("\\", "/").split("/"):
+            # Outside the walked tree: fall back to globbing the filesystem
+            matches[i] = [p for p in glob.glob(pattern, recursive=True) if not os.path.isdir(p)]
+        else:
+            matchers.append((i, compile_glob(pattern).fullmatch))
+
+    for path, posix_path in repo_files:
+        for i, fullmatch in matchers:
+            if fullmatch(posix_path):
+                matches[i].append(path)
+                break
+    return matches
+
+def get_ignored_dir_names(ignore_patterns: List[str]) -> Set[str]:
+    """
+    Directory names that can be pruned from the walk outright.
+
+    '**/name/**' ignores every file below any directory called 'name', and a
+    bare wildcard-free 'name' is treated as a directory name too. Anything
+    else is left to the per-file should_skip_file() check.
+    """
+    dir_names: Set[str] = set()
     for pattern in ignore_patterns:
-        if pattern in file_path:
-            return True
-    return False
+        name = pattern
+        if pattern.startswith("**/") and pattern.endswith("/**"):
+            name = pattern[3:-3]
+        if name and not any(c in name for c in "*?[/\\"):
+            dir_names.add(name)
+    return dir_names
+
+def is_doc_up_to_date(file_path: str, output_path: str, template_name: str) -> bool:
+    """True if the existing doc is newer than both the source file and its template."""
+    try:
+        doc_mtime = os.path.getmtime(output_path)
+        if doc_mtime < os.path.getmtime(file_path):
+            return False
+    except OSError:
+        return False
+
+    template_path = os.path.join(TEMPLATE_DIR, template_name)
+    try:
+        return doc_mtime >= os.path.getmtime(template_path)
+    except OSError:
+        return True  # Missing template: the generic fallback prompt is used
+
+def get_changed_files(ref: str) -> Optional[Set[str]]:
+    """
+    Files changed between a git ref and the working tree ('/'-separated,
+    relative to the current directory). Returns None if git cannot answer,
+    e.g. outside a repository or when the ref (such as HEAD@{1}) does not exist.
+    """
+    try:
+        # -z: NUL-separated and unquoted, so non-ASCII paths come through verbatim.
+        # Decode like os.fsdecode so names compare equal to the walked paths.
+        output = subprocess.run(
+            ["git", "diff", "--name-only", "--relative", "-z", ref],
+            check=True, capture_output=True,
+            encoding=sys.getfilesystemencoding(), errors="surrogateescape"
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        stderr = getattr(e, "stderr", None) or e
+        logging.warning(f"Could not list files changed since '{ref}', processing all files: {str(stderr).strip()}")
+        return None
+    return {name for name in output.split("\0") if name}
+
+def get_response_cache_path(prompt: str, model: str) -> str:
+    """Cache location for the documentation generated from this prompt and model."""
+    key = hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+    return os.path.join(RESPONSE_CACHE_DIR, f"{key}.md")
+
+def read_cached_response(cache_path: str) -> Optional[str]:
+    """Returns cached documentation, or None on a cache miss."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            doc_content = f.read()
+    except (IOError, OSError):
+        return None
+    try:
+        # Mark the entry as used, so prune_response_cache keeps it
+        os.utime(cache_path)
+    except OSError:
+        pass
+    return doc_content
+
+def write_cached_response(cache_path: str, doc_content: str) -> None:
+    """Stores generated documentation in the response cache (best effort)."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(doc_content)
+        os.replace(tmp_path, cache_path)
+    except (IOError, OSError) as e:
+        logging.debug(f"Could not write response cache {cache_path}: {e}")
+
+def prune_response_cache(since: float) -> int:
+    """
+    Deletes cached responses not read or written since the given time.
+
+    After a full run, anything older belongs to source or templates that have
+    since changed, so pruning keeps the cache from growing across runs.
+    Returns the number of entries removed.
+    """
+    removed = 0
+    try:
+        entries = list(os.scandir(RESPONSE_CACHE_DIR))
+    except OSError:
+        return 0
+
+    for entry in entries:
+        if not entry.name.endswith((".md", ".tmp")):
+            continue
+        try:
+            if entry.stat().st_mtime < since:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError as e:
+            logging.debug(f"Could not prune {entry.path}: {e}")
+    return removed
 
 def get_file_size_warning(file_path: str) -> Optional[str]:
     """Returns a warning message if file is large, None otherwise."""
@@ -155,8 +467,400 @@ def get_file_size_warning(file_path: str) -> Optional[str]:
         pass
     return None
 
+def read_notebook_cells(file_path: str) -> Optional[str]:
+    """
+    Extracts the code and markdown cells of a Jupyter notebook.
+
+    Outputs (including base64 images) and metadata usually make up most of
+    the notebook JSON but add nothing to the docs. Returns None if the file
+    is not a readable notebook.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            notebook = json.load(f)
+
+        parts: List[str] = []
+        for cell in notebook["cells"]:
+            cell_type = cell.get("cell_type")
+            if cell_type in ("code", "markdown"):
+                source = cell.get("source", "")
+                if isinstance(source, list):
+                    source = "".join(source)
+                parts.append(f"# [{cell_type}]\n{source}")
+        return "\n\n".join(parts)
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        logging.debug(f"Could not parse notebook {file_path}, sending raw content: {e}")
+        return None
+
+def read_source(file_path: str) -> str:
+    """Reads a source file, truncated to the content limit sent to the LLM."""
+    content = read_notebook_cells(file_path) if file_path.endswith(".ipynb") else None
+    from_notebook = content is not None
+
+    if content is None:
+        # Read at most one character past the limit, so large files are never
+        # loaded in full just to be cut down
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            content = f.read(MAX_CONTENT_CHARS + 1)
+
+    if len(content) > MAX_CONTENT_CHARS:
+        if from_notebook:
+            # Extracted cells are fully in memory; the file size would count the JSON
+            total_size = f"{len(content)} characters"
+        else:
+            total_size = f"{os.path.getsize(file_path)} bytes"
+        content = content[:MAX_CONTENT_CHARS] + f"\n\n[...truncated from {total_size}]\n"
+    return content
+
+def render_prompt(template: str, file_path: str, content: str) -> str:
+    """Fills the {{filename}} and {{content}} placeholders of a template."""
+    return template.replace("{{filename}}", file_path).replace("{{content}}", content)
+
+class OutputDir:
+    """
+    The directory generated docs are written to.
+
+    Where the platform supports it, the directory is opened once and files
+    are created relative to that descriptor (openat), so each write does not
+    resolve the directory path again. The descriptor is shared by all
+    concurrent requests. Use as a context manager to close it.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fd: Optional[int] = None
+        if DIR_FD_SUPPORTED:
+            self.fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+            logging.debug(f"Writing docs relative to directory fd {self.fd} ({path})")
+        else:
+            logging.debug(f"dir_fd not supported on this platform, writing docs by path ({path})")
+
+    def _opener(self, name: str, flags: int) -> int:
+        return os.open(name, flags, 0o666, dir_fd=self.fd)
+
+    def open(self, name: str) -> TextIO:
+        """Open a file in this directory for writing (text, UTF-8)."""
+        if self.fd is None:
+            return open(os.path.join(self.path, name), "w", encoding="utf-8")
+        return open(name, "w", encoding="utf-8", opener=self._opener)
+
+    def replace(self, src: str, dst: str) -> None:
+        """Atomically rename a file within this directory."""
+        if self.fd is None:
+            os.replace(os.path.join(self.path, src), os.path.join(self.path, dst))
+        else:
+            os.replace(src, dst, src_dir_fd=self.fd, dst_dir_fd=self.fd)
+
+    def remove(self, name: str) -> None:
+        """Delete a file in this directory, if present."""
+        try:
+            if self.fd is None:
+                os.unlink(os.path.join(self.path, name))
+            else:
+                os.unlink(name, dir_fd=self.fd)
+        except FileNotFoundError:
+            pass
+
+    def close(self) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def __enter__(self) -> "OutputDir":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+def get_doc_name(file_path: str) -> str:
+    """Flat wiki filename for a source file: "folder_subfolder_filename.md"."""
+    return file_path.translate(SAFE_NAME_TABLE) + ".md"
+
+def write_doc_header(f: TextIO, file_path: str, category: str) -> None:
+    """Writes the wiki metadata comments read back by organize_docs.py."""
+    f.write(f"<!-- Category: {category} -->\n")
+    f.write(f"<!-- Source: {file_path} -->\n\n")
+
+def save_doc(file_path: str, category: str, doc_content: str, output: OutputDir) -> str:
+    """Writes a generated doc (with wiki metadata headers). Returns the output path."""
+    safe_name = get_doc_name(file_path)
+    output_path = os.path.join(output.path, safe_name)
+
+    with output.open(safe_name) as f:
+        write_doc_header(f, file_path, category)
+        f.write(doc_content)
+
+    logging.info(f"  Saved: {output_path}")
+    return output_path
+
+async def stream_doc(
+    file_path: str,
+    category: str,
+    prompt: str,
+    llm: LLMProvider,
+    model: str,
+    output: OutputDir
+) -> str:
+    """
+    Streams the LLM response for a file straight into its doc.
+
+    Chunks are written as they arrive to a '.part' file, which replaces the
+    doc only once the response is complete and non-empty. Returns the cleaned
+    doc content ("" if the response was empty).
+    """
+    safe_name = get_doc_name(file_path)
+    part_name = f"{safe_name}.part"
+    cleaner = MarkdownStreamCleaner()
+    pieces: List[str] = []
+
+    try:
+        with output.open(part_name) as f:
+            write_doc_header(f, file_path, category)
+            async for chunk in llm.stream(prompt, model):
+                text = cleaner.feed(chunk)
+                if text:
+                    f.write(text)
+                    pieces.append(text)
+            text = cleaner.finish()
+            f.write(text)
+            pieces.append(text)
+    except BaseException:
+        output.remove(part_name)
+        raise
+
+    doc_content = "".join(pieces)
+    if not doc_content:
+        output.remove(part_name)
+        return ""
+
+    output.replace(part_name, safe_name)
+    logging.info(f"  Saved: {os.path.join(output.path, safe_name)}")
+    return doc_content
+
+async def process_file(
+    file_path: str,
+    template_name: str,
+    category: str,
+    llm: LLMProvider,
+    model: str,
+    output: OutputDir,
+    use_cache: bool = True
+) -> bool:
+    """Generate and save documentation for a single file. Returns True if saved."""
+    logging.info(f"Processing: {file_path}")
+
+    try:
+        content = read_source(file_path)
+        prompt = render_prompt(load_template(template_name), file_path, content)
+
+        # Unchanged file, template and model: reuse the previous documentation
+        cache_path = get_response_cache_path(prompt, model)
+        doc_content = read_cached_response(cache_path) if use_cache else None
+
+        if doc_content:
+            logging.info(f"  Cache hit for {file_path}")
+            save_doc(file_path, category, doc_content, output)
+            return True
+
+        # Call LLM, writing the doc as the response streams in
+        doc_content = await stream_doc(file_path, category, prompt, llm, model, output)
+        if not doc_content:
+            logging.warning(f"  Empty response for {file_path}")
+            return False
+
+        write_cached_response(cache_path, doc_content)
+        return True
+
+    except (IOError, OSError) as e:
+        logging.error(f"Failed to read {file_path}: {e}")
+    except Exception as e:
+        logging.error(f"Failed to process {file_path}: {e}")
+    return False
+
+# --- Prompt Batching ---
+
+# A documentation job: (file_path, template_name, category)
+DocJob = Tuple[str, str, str]
+
+BATCH_PROMPT = """You will document {count} files. Follow the instructions below for EACH file separately.
+
+Return one Markdown document per file, in the same order as the files are given.
+Start each document with a line containing only `{doc_marker} <path> ===`, using the exact path shown for that file.
+Do not add any text before the first document or wrap the answer in code fences.
+
+--- Instructions ---
+{instructions}
+--- End of Instructions ---
+
+{files}"""
+BATCH_FILE_MARKER = "=== FILE:"
+BATCH_DOC_MARKER = "=== DOC:"
+BATCH_DOC_RE = re.compile(r"^=== DOC: (.+?) ===[ \t]*$", re.MULTILINE)
+
+def split_batch_response(text: Optional[str]) -> Dict[str, str]:
+    """Splits a batched LLM response into {file_path: markdown}."""
+    if not text:
+        return {}
+    docs: Dict[str, str] = {}
+    matches = list(BATCH_DOC_RE.finditer(text))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        doc_content = clean_markdown_response(text[match.end():end])
+        if doc_content:
+            docs[match.group(1).strip()] = doc_content
+    return docs
+
+class BatchingProcessor:
+    """
+    Groups small files that share a template into a single LLM request.
+
+    Files are buffered per template and flushed into a batch once it reaches
+    max_files or max_chars; larger files always get a request of their own.
+    Each batch is processed with the run() coroutine; batches can run concurrently.
+    """
+
+    def __init__(
+        self,
+        llm: LLMProvider,
+        model: str,
+        output: OutputDir,
+        use_cache: bool = True,
+        max_files: int = DEFAULT_BATCH_SIZE,
+        max_chars: int = BATCH_MAX_CHARS
+    ):
+        self.llm = llm
+        self.model = model
+        self.output = output
+        self.use_cache = use_cache
+        self.max_files = max_files
+        self.max_chars = max_chars
+        self._pending: Dict[str, Tuple[List[DocJob], int]] = {}
+        self._batches: List[List[DocJob]] = []
+
+    def add(self, file_path: str, template_name: str, category: str) -> None:
+        """Queue a file, flushing its template's buffer when the batch is full."""
+        job = (file_path, template_name, category)
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = self.max_chars
+
+        if self.max_files <= 1 or size > BATCH_FILE_MAX_BYTES:
+            self._batches.append([job])
+            return
+
+        jobs, chars = self._pending.get(template_name, ([], 0))
+        if jobs and (len(jobs) >= self.max_files or chars + size > self.max_chars):
+            self._batches.append(jobs)
+            jobs, chars = [], 0
+        jobs.append(job)
+        self._pending[template_name] = (jobs, chars + size)
+
+    def batches(self) -> List[List[DocJob]]:
+        """Flush all buffers and return every batch queued so far."""
+        self._batches.extend(jobs for jobs, _ in self._pending.values())
+        self._pending.clear()
+        return self._batches
+
+    async def run(self, batch: List[DocJob]) -> List[str]:
+        """Document every file in a batch. Returns the paths that were saved."""
+        if len(batch) == 1:
+            file_path, template_name, category = batch[0]
+            ok = await process_file(file_path, template_name, category, self.llm, self.model, self.output, self.use_cache)
+            return [file_path] if ok else []
+
+        saved: List[str] = []
+        # (job, content, single-file prompt) for files that need the LLM
+        misses: List[Tuple[DocJob, str, str]] = []
+        template_name = batch[0][1]
+        template = ""
+
+        for job in batch:
+            file_path, _, category = job
+            logging.info(f"Processing: {file_path} (batched)")
+            try:
+                template = load_template(template_name)
+                content = read_source(file_path)
+                prompt = render_prompt(template, file_path, content)
+                cached = read_cached_response(get_response_cache_path(prompt, self.model)) if self.use_cache else None
+                if cached:
+                    logging.info(f"  Cache hit for {file_path}")
+                    save_doc(file_path, category, cached, self.output)
+                    saved.append(file_path)
+                else:
+                    misses.append((job, content, prompt))
+            except (IOError, OSError) as e:
+                logging.error(f"Failed to read {file_path}: {e}")
+            except Exception as e:
+                logging.error(f"Failed to process {file_path}: {e}")
+
+        docs: Dict[str, str] = {}
+        if len(misses) > 1:
+            files_section = "\n\n".join(
+                f"{BATCH_FILE_MARKER} {job[0]} ===\n{content}" for job, content, _ in misses
+            )
+            prompt = BATCH_PROMPT.format(
+                count=len(misses),
+                doc_marker=BATCH_DOC_MARKER,
+                instructions=render_prompt(template, "(see each file below)", "(see the files below)"),
+                files=files_section
+            )
+            try:
+                docs = split_batch_response(await self.llm.generate(prompt, self.model))
+            except Exception as e:
+                logging.warning(f"Batched request for {len(misses)} files failed, retrying individually: {e}")
+
+        for (file_path, _, category), _, prompt in misses:
+            doc_content = docs.get(file_path)
+            if not doc_content:
+                # Not batched, or missing from the batched response
+                if await process_file(file_path, template_name, category, self.llm, self.model, self.output, self.use_cache):
+                    saved.append(file_path)
+                continue
+            try:
+                write_cached_response(get_response_cache_path(prompt, self.model), doc_content)
+                save_doc(file_path, category, doc_content, self.output)
+                saved.append(file_path)
+            except (IOError, OSError) as e:
+                logging.error(f"Failed to save documentation for {file_path}: {e}")
+            except Exception as e:
+                logging.error(f"Failed to process {file_path}: {e}")
+
+        return saved
+
 # --- Main Logic ---
 
+async def document_files(
+    tasks: List[DocJob],
+    llm: LLMProvider,
+    model: str,
+    output_dir: str,
+    concurrency: int,
+    batch_size: int,
+    use_cache: bool
+) -> List[str]:
+    """
+    Document all files, with at most `concurrency` LLM requests in flight.
+
+    Requests are pure network I/O, so a single event loop drives them all.
+    Returns the paths that were saved.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    with OutputDir(output_dir) as output:
+        # Small files sharing a template are combined into one request
+        processor = BatchingProcessor(llm, model, output, use_cache=use_cache, max_files=batch_size)
+        for file_path, template_name, category in tasks:
+            processor.add(file_path, template_name, category)
+
+        async def run_batch(batch: List[DocJob]) -> List[str]:
+            async with semaphore:
+                return await processor.run(batch)
+
+        results = await asyncio.gather(*(run_batch(batch) for batch in processor.batches()))
+
+    return [file_path for saved in results for file_path in saved]
+
 def main():
     parser = argparse.ArgumentParser(description="Generate AI-powered documentation from source code.")
     parser.add_argument(
@@ -169,20 +873,59 @@ def main():
         action="store_true",
         help="Enable verbose/debug logging"
     )
+    parser.add_argument(
+        "--concurrency", "-j",
+        type=int,
+        default=None,
+        help=f"Max concurrent LLM requests (default: config 'concurrency' or {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help=f"Max small files per LLM request, 1 disables batching (default: config 'batch_size' or {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate docs even if they are newer than their source files"
+    )
+    parser.add_argument(
+        "--changed-since",
+        nargs="?",
+        const="HEAD@{1}",
+        default=None,
+        metavar="REF",
+        help="Only process files changed since a git ref (default: HEAD@{1}, the state before the last pull)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM, ignoring previously generated documentation"
+    )
+    parser.add_argument(
+        "--prune-cache",
+        action="store_true",
+        help="Delete cached responses this run did not use (for full runs, e.g. in CI)"
+    )
     args = parser.parse_args()
+    # A little slack: file timestamps can lag the wall clock slightly
+    run_started = time.time() - 1
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
     config = load_config()
 
+    model = config.get("model", "gemini-2.5-flash")
+    output_dir = config.get("wiki_dir", "wiki_content")
+    concurrency = max(1, args.concurrency or config.get("concurrency") or DEFAULT_CONCURRENCY)
+    batch_size = args.batch_size or config.get("batch_size") or DEFAULT_BATCH_SIZE
+
     # Initialize Provider (skip in dry-run mode)
     llm = None
     if not args.dry_run:
-        llm = get_llm_provider(config)
-
-    model = config.get("model", "gemini-2.5-flash")
-    output_dir = config.get("wiki_dir", "wiki_content")
+        llm = get_llm_provider(config, max_connections=concurrency)
 
     if not args.dry_run and not os.path.exists(output_dir):
         os.makedirs(output_dir)
@@ -193,10 +936,14 @@ def main():
     logging.info(f"{'[DRY RUN] ' if args.dry_run else ''}Starting Documentation Generation")
     logging.info(f"Project: {project_name}")
     if not args.dry_run:
-        logging.info(f"Provider: {provider_name} | Model: {model}")
+        logging.info(f"Provider: {provider_name} | Model: {model} | Concurrency: {concurrency}")
 
     processed_files: List[str] = []
     skipped_files: List[str] = []
+    up_to_date_files: List[str] = []
+    unchanged_files: List[str] = []
+    tasks: List[DocJob] = []
+    queued_files: Set[str] = set()
 
     # Ensure targets is iterable (handle None from YAML)
     targets: List[Dict[str, Any]] = config.get("targets") or []
@@ -206,7 +953,25 @@ def main():
         logging.warning("No targets configured. Run discover_targets.py first or add targets to config.yaml")
         return
 
-    for target in targets:
+    # Walk the repository once, without descending into ignored directories,
+    # and assign each file to its target
+    ignore_re = compile_ignore_patterns(ignore_patterns)
+    prune_dirs = WALK_PRUNE_DIRS | get_ignored_dir_names(ignore_patterns)
+    logging.debug(f"Pruning directories: {sorted(prune_dirs)}")
+    repo_files: List[Tuple[str, str]] = [
+        (path, path.replace(os.sep, "/")) for path, _ in iter_repo_files(".", prune_dirs=prune_dirs)
+    ]
+
+    # Restrict to files changed in git, if requested (None: process everything)
+    changed_files: Optional[Set[str]] = None
+    if args.changed_since:
+        changed_files = get_changed_files(args.changed_since)
+        if changed_files is not None:
+            logging.info(f"{len(changed_files)} files changed since {args.changed_since}")
+
+    target_files = match_target_files([target.get("pattern") for target in targets], repo_files)
+
+    for target, files in zip(targets, target_files):
         pattern = target.get("pattern")
         template_name = target.get("template")
         category = target.get("category", "General")
@@ -214,20 +979,32 @@ def main():
 
         logging.info(f"Processing target: {target_name} (pattern: {pattern})")
 
-        # Recursive glob
-        files = glob.glob(pattern, recursive=True)
-
         for file_path in files:
-            # Skip directories
-            if os.path.isdir(file_path):
-                continue
-
             # Skip ignored files
-            if should_skip_file(file_path, ignore_patterns):
+            if should_skip_file(file_path, ignore_re):
                 logging.debug(f"Skipping (ignore pattern): {file_path}")
                 skipped_files.append(file_path)
                 continue
 
+            # Skip files git reports as unchanged
+            if changed_files is not None and file_path.replace(os.sep, "/") not in changed_files:
+                logging.debug(f"Skipping (unchanged since {args.changed_since}): {file_path}")
+                unchanged_files.append(file_path)
+                continue
+
+            # Earlier targets take precedence when patterns overlap
+            if file_path in queued_files:
+                logging.debug(f"Skipping (already matched by an earlier target): {file_path}")
+                continue
+            queued_files.add(file_path)
+
+            # Skip files whose doc is newer than the source (unless --force)
+            output_path = os.path.join(output_dir, get_doc_name(file_path))
+            if not args.force and is_doc_up_to_date(file_path, output_path, template_name):
+                logging.debug(f"Skipping (doc up to date): {file_path}")
+                up_to_date_files.append(file_path)
+                continue
+
             # Check file size
             size_warning = get_file_size_warning(file_path)
             if size_warning:
@@ -238,49 +1015,40 @@ def main():
                 processed_files.append(file_path)
                 continue
 
-            logging.info(f"Processing: {file_path}")
+            tasks.append((file_path, template_name, category))
 
+    if tasks:
+        async def run_tasks() -> List[str]:
             try:
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read()
-
-                template = load_template(template_name)
-                # Template substitution with content truncation
-                prompt = template.replace("{{filename}}", file_path).replace("{{content}}", content[:MAX_CONTENT_CHARS])
-
-                # Call LLM
-                response_text = llm.generate(prompt, model)
-                doc_content = clean_markdown_response(response_text)
-
-                if doc_content:
-                    # Create a flat filename for wiki: "folder_subfolder_filename.md"
-                    safe_name = file_path.replace("\\", "_").replace("/", "_").replace(".", "_") + ".md"
-                    output_path = os.path.join(output_dir, safe_name)
+                return await document_files(
+                    tasks, llm, model, output_dir, concurrency, batch_size, use_cache=not args.no_cache
+                )
+            finally:
+                # The client is bound to this event loop, so close it before the loop ends
+                await close_llm_provider()
 
-                    with open(output_path, "w", encoding="utf-8") as f:
-                        f.write(f"<!-- Category: {category} -->\n")
-                        f.write(f"<!-- Source: {file_path} -->\n\n")
-                        f.write(doc_content)
+        processed_files.extend(asyncio.run(run_tasks()))
 
-                    processed_files.append(file_path)
-                    logging.info(f"  Saved: {output_path}")
-                else:
-                    logging.warning(f"  Empty response for {file_path}")
-
-            except (IOError, OSError) as e:
-                logging.error(f"Failed to read {file_path}: {e}")
-            except Exception as e:
-                logging.error(f"Failed to process {file_path}: {e}")
+    if args.prune_cache and not args.dry_run:
+        pruned = prune_response_cache(run_started)
+        logging.info(f"Pruned {pruned} unused cached responses.")
 
     # Summary
     logging.info("=" * 50)
     if args.dry_run:
         logging.info(f"[DRY RUN] Would process {len(processed_files)} files")
         logging.info(f"[DRY RUN] Would skip {len(skipped_files)} files (ignore patterns)")
+        logging.info(f"[DRY RUN] Would skip {len(up_to_date_files)} files (doc up to date)")
+        if changed_files is not None:
+            logging.info(f"[DRY RUN] Would skip {len(unchanged_files)} files (unchanged since {args.changed_since})")
     else:
         logging.info(f"Completed. Processed {len(processed_files)} files.")
         if skipped_files:
             logging.info(f"Skipped {len(skipped_files)} files (ignore patterns).")
+        if up_to_date_files:
+            logging.info(f"Skipped {len(up_to_date_files)} files (doc up to date, use --force to regenerate).")
+        if unchanged_files:
+            logging.info(f"Skipped {len(unchanged_files)} files (unchanged since {args.changed_since}).")
 
 if __name__ == "__main__":
     main()
@@ -6,6 +6,8 @@ import shutil
 import logging
 from typing import Dict, List, Tuple, Any
 
+from docs_common import load_yaml_cached
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,8 +25,7 @@ def load_config() -> Dict[str, Any]:
     if not os.path.exists(CONFIG_PATH):
         return {}
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return yaml.safe_load(f) or {}
+        return load_yaml_cached(CONFIG_PATH) or {}
     except (yaml.YAMLError, IOError) as e:
         logging.error(f"Failed to load config: {e}")
         return {}